@@ -1,9 +1,16 @@
-REFUND_DATABASE = {
+import sys
+
+from types import MappingProxyType
+
+_REFUND_DATA = {
     "12345": "Processed",
     "67890": "Pending",
     "11111": "Rejected"
 }
 
+# Read-only view with interned keys
+REFUND_DATABASE = MappingProxyType({sys.intern(k): v for k, v in _REFUND_DATA.items()})
+
 TECH_SUPPORT_RESPONSES = {
     "default": "Please try restarting the application and clearing the cache."
 }
@@ -1,12 +1,18 @@
 import asyncio
 
 from loguru import logger
-from langchain_openai import ChatOpenAI
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from dotenv import load_dotenv
 
 from src.router import CustomerSupportRouter
 from src.services.llm import LangchainLLM
 
+try:
+    # libuv-based event loop with lower scheduling overhead (not available on Windows)
+    import uvloop
+except ImportError:
+    uvloop = None
+
 
 load_dotenv()
 
@@ -16,8 +22,11 @@ async def main():
     openai_model = ChatOpenAI(model='gpt-3.5-turbo')
     llm_provider = LangchainLLM(openai_model)
 
+    # Embeddings enable the semantic cache for general chat responses (optional)
+    embeddings = OpenAIEmbeddings(model='text-embedding-3-small')
+
     # Create router
-    router = CustomerSupportRouter(llm_provider)
+    router = CustomerSupportRouter(llm_provider, embeddings)
 
     # Test cases
     test_queries = [
@@ -26,16 +35,22 @@ async def main():
         "Hi! Just wanted to say your service is great!"
     ]
 
-    for i, query in enumerate(test_queries, 1):
-        logger.info(f"\n{'=' * 60}")
-        logger.info(f"Test Case {i}: {query}")
-        logger.info('=' * 60)
+    try:
+        for i, query in enumerate(test_queries, 1):
+            logger.info(f"\n{'=' * 60}")
+            logger.info(f"Test Case {i}: {query}")
+            logger.info('=' * 60)
 
-        result = await router.route_query(query)
-        logger.info(f"Route: {result.route}")
-        logger.info(f"Response: {result.response}")
-        logger.info(f"Data: {result.data}")
+            result = await router.route_query(query)
+            logger.info(f"Route: {result.route}")
+            logger.info(f"Response: {result.response}")
+            logger.info(f"Data: {result.data}")
+    finally:
+        await router.aclose()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
@@ -1,7 +1,8 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
 
 
-class LLMResponse(BaseModel):
+@dataclass(slots=True, frozen=True)
+class LLMResponse:
     """Standardized LLM response"""
     content: str
     model: str
@@ -1,7 +1,12 @@
-from pydantic import BaseModel, Field
+from dataclasses import asdict, dataclass, field
 
 
-class QueryResponse(BaseModel):
+@dataclass(slots=True, frozen=True)
+class QueryResponse:
     route: str
     response: str
-    data: dict = Field(default_factory=dict)
+    data: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        """Return the response as a plain dictionary for serialization."""
+        return asdict(self)
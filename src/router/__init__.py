@@ -1,11 +1,18 @@
+import inspect
+
+from typing import AsyncIterator, Optional
+from langchain_core.embeddings import Embeddings
 from loguru import logger
 from src.router.classifier import QueryClassifier, RouteType
-from src.router.handlers import RefundHandler, TechnicalSupportHandler, GeneralChatHandler
+from src.router.handlers import Handler, RefundHandler, TechnicalSupportHandler, GeneralChatHandler
 from src.services.llm import LangchainLLM
 from src.models.schemas import QueryResponse
 
 
-def _initialize_handlers(llm_provider: LangchainLLM) -> dict[RouteType, object]:
+def _initialize_handlers(
+    llm_provider: LangchainLLM,
+    embeddings: Optional[Embeddings] = None
+) -> dict[RouteType, Handler]:
     """
     Initialize and return handler mapping for each route type.
 
@@ -14,6 +21,7 @@ def _initialize_handlers(llm_provider: LangchainLLM) -> dict[RouteType, object]:
 
     Args:
         llm_provider: The LLM provider instance to pass to handlers that require it.
+        embeddings: Optional embedding model used by handlers that cache responses semantically.
 
     Returns:
         Dictionary mapping RouteType enum values to their corresponding handler instances.
@@ -21,7 +29,7 @@ def _initialize_handlers(llm_provider: LangchainLLM) -> dict[RouteType, object]:
     return {
         RouteType.REFUND_REQUEST: RefundHandler(),
         RouteType.TECHNICAL_SUPPORT: TechnicalSupportHandler(),
-        RouteType.GENERAL_CHIT_CHAT: GeneralChatHandler(llm_provider)
+        RouteType.GENERAL_CHIT_CHAT: GeneralChatHandler(llm_provider, embeddings)
     }
 
 
@@ -32,15 +40,17 @@ class CustomerSupportRouter:
     Classifies incoming customer queries and routes them to the appropriate handler
     based on the query type (refund, technical support, or general chat).
     """
-    def __init__(self, llm_provider: LangchainLLM):
+    def __init__(self, llm_provider: LangchainLLM, embeddings: Optional[Embeddings] = None):
         """
         Initialize the customer support router.
 
         Args:
             llm_provider: The LLM provider instance used for query classification.
+            embeddings: Optional embedding model enabling the semantic cache
+                        for general chat responses.
         """
         self.classifier = QueryClassifier(llm_provider)
-        self.handlers = _initialize_handlers(llm_provider)
+        self.handlers = _initialize_handlers(llm_provider, embeddings)
 
     async def route_query(self, query: str) -> QueryResponse:
         """
@@ -48,7 +58,8 @@ class CustomerSupportRouter:
 
         This method classifies the incoming query using the QueryClassifier,
         logs the classification result, and delegates handling to the appropriate
-        handler based on the route type.
+        handler based on the route type. A handler's result is awaited only if it
+        is awaitable, so synchronous handlers skip the event loop.
 
         Args:
             query: The customer's query string.
@@ -56,7 +67,49 @@ class CustomerSupportRouter:
         Returns:
             QueryResponse object containing the route, response, and associated data.
         """
+        route_type = await self._classify(query)
+        response = self.handlers[route_type].handle(query)
+        if inspect.isawaitable(response):
+            response = await response
+        return response
+
+    async def stream_query(self, query: str) -> AsyncIterator[str]:
+        """
+        Classify a customer query and stream the response text of its handler.
+
+        Handlers that generate text progressively (such as general chat) yield
+        chunks as they are produced; other handlers yield their complete response
+        as a single chunk.
+
+        Args:
+            query: The customer's query string.
+
+        Yields:
+            Chunks of the response text.
+        """
+        route_type = await self._classify(query)
+        async for chunk in self.handlers[route_type].stream_handle(query):
+            yield chunk
+
+    async def _classify(self, query: str) -> RouteType:
+        """
+        Classify a query with the QueryClassifier and log the result.
+
+        Args:
+            query: The customer's query string.
+
+        Returns:
+            RouteType enum value for the query.
+        """
         route_type = await self.classifier.classify(query)
         logger.info(f"Classified as: {route_type.value}")
-        handler = self.handlers[route_type]
-        return await handler.handle(query)
\ No newline at end of file
+        return route_type
+
+    async def aclose(self) -> None:
+        """
+        Release resources held by the router's handlers, such as pooled HTTP connections.
+
+        Should be called once when the router is no longer needed.
+        """
+        for handler in self.handlers.values():
+            await handler.aclose()
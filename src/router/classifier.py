@@ -1,8 +1,12 @@
+import asyncio
+import re
+
 from enum import Enum
+from langchain_core.messages import HumanMessage
 from loguru import logger
 
 from src.services.llm import LangchainLLM
-from src.router.system_prompt import ROUTER_PROMPT, GENERAL_SUPPORT_PROMPT
+from src.router.system_prompt import ROUTER_SYSTEM_PROMPT, ROUTER_BATCH_SYSTEM_PROMPT, build_system_message
 
 
 class RouteType(str, Enum):
@@ -19,6 +23,47 @@ class RouteType(str, Enum):
     GENERAL_CHIT_CHAT = "GENERAL_CHIT_CHAT"
 
 
+_REFUND_RE = re.compile(r'\b(refund\w*|return\w*|money back|order\s*#?\d+)\b', re.IGNORECASE)
+_TECH_RE = re.compile(
+    # Contractions ("doesn't work") sit outside the \b group: there is no word
+    # boundary between "s" and "n" in "doesn't"
+    r"\b(crash\w*|bugs?|errors?|not\s+work\w*|log(?:ging)?\s*in|sign(?:ing)?\s*in|password)\b"
+    r"|n['’]t\s+work\w*",
+    re.IGNORECASE
+)
+_BATCH_LINE_RE = re.compile(r'^\s*(\d+)[.):]?\s*(\w+)')
+
+# Queries longer than this that match no keyword are considered ambiguous
+# and are sent to the LLM instead of defaulting to GENERAL_CHIT_CHAT.
+_AMBIGUOUS_QUERY_LENGTH = 80
+
+
+def _match_keywords(query: str) -> RouteType | None:
+    """
+    Classify a query using precompiled keyword patterns.
+
+    Checks refund keywords first, then technical support keywords, so a query
+    mentioning both (e.g. "the app crashed, I want a refund") is a refund request.
+    This covers the high-confidence cases (refund questions with an order number,
+    app crashes, login failures, error codes) without any LLM call. Short queries
+    that match neither are treated as general chat; long ones are left undecided.
+
+    Args:
+        query: The customer query string to classify.
+
+    Returns:
+        A RouteType enum value, or None if the query is ambiguous and should be
+        classified by the LLM.
+    """
+    if _REFUND_RE.search(query):
+        return RouteType.REFUND_REQUEST
+    if _TECH_RE.search(query):
+        return RouteType.TECHNICAL_SUPPORT
+    if len(query) <= _AMBIGUOUS_QUERY_LENGTH:
+        return RouteType.GENERAL_CHIT_CHAT
+    return None
+
+
 def _parse_classification(classification_text: str) -> RouteType:
     """
     Parse LLM response text into a RouteType enum value.
@@ -40,13 +85,40 @@ def _parse_classification(classification_text: str) -> RouteType:
         return RouteType.GENERAL_CHIT_CHAT
 
 
+def _parse_batch_classification(classification_text: str, count: int) -> list[RouteType]:
+    """
+    Parse a batched LLM response into one RouteType per query.
+
+    Expects one "<number>. <CATEGORY>" line per query. Queries whose line is
+    missing or invalid default to GENERAL_CHIT_CHAT.
+
+    Args:
+        classification_text: The raw text response from the LLM classifier.
+        count: The number of queries in the batch.
+
+    Returns:
+        A list of RouteType enum values, in the same order as the batched queries.
+    """
+    labels: dict[int, str] = {}
+    for line in classification_text.splitlines():
+        match = _BATCH_LINE_RE.match(line)
+        if match:
+            labels.setdefault(int(match.group(1)), match.group(2))
+    return [_parse_classification(labels.get(i, "")) for i in range(1, count + 1)]
+
+
 class QueryClassifier:
     """
     Classifier for customer support queries.
 
-    Uses an LLM to classify incoming customer queries into one of the predefined
-    route types (refund request, technical support, or general chat).
+    Classifies incoming customer queries into one of the predefined route types
+    (refund request, technical support, or general chat) using keyword patterns,
+    falling back to an LLM for ambiguous queries. Concurrent LLM classifications
+    are collected for a short window and sent to the model as a single batch.
     """
+    BATCH_WINDOW = 0.01
+    MAX_BATCH = 32
+
     def __init__(self, llm_provider: LangchainLLM):
         """
         Initialize the query classifier.
@@ -55,14 +127,21 @@ class QueryClassifier:
             llm_provider: The LLM provider instance to use for classification.
         """
         self.llm = llm_provider
-        self.prompt = ROUTER_PROMPT
+        # The system prompts are static, so their messages are built once and reused.
+        # Keeping them identical across calls also lets providers cache the prompt prefix.
+        model_name = llm_provider.get_model_name()
+        self._system_msg = build_system_message(ROUTER_SYSTEM_PROMPT, model_name)
+        self._batch_system_msg = build_system_message(ROUTER_BATCH_SYSTEM_PROMPT, model_name)
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+        self._batch_tasks: set[asyncio.Task] = set()
 
     async def classify(self, query: str) -> RouteType:
         """
         Classify a customer query into one of the supported route types.
 
-        Formats the query using the router prompt template, invokes the LLM
-        to classify it, and parses the response into a RouteType enum value.
+        Matches the query against keyword patterns first. Only ambiguous queries
+        are queued for the LLM, which classifies them in batches.
 
         Args:
             query: The customer query string to classify.
@@ -70,8 +149,95 @@ class QueryClassifier:
         Returns:
             RouteType enum value indicating the classification of the query.
         """
-        formatted_messages = self.prompt.format_messages(query=query)
-        messages_dict = [{"role": msg.type, "content": msg.content} for msg in formatted_messages]
-        response = await self.llm.invoke(messages_dict)
+        route_type = _match_keywords(query)
+        if route_type is not None:
+            return route_type
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((query, future))
+        if len(self._pending) >= self.MAX_BATCH:
+            self._flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self) -> None:
+        """Wait for the batching window to elapse, then flush pending queries."""
+        await asyncio.sleep(self.BATCH_WINDOW)
+        self._flush_task = None
+        self._flush()
+
+    def _flush(self) -> None:
+        """
+        Send all pending queries to the LLM as one batch.
+
+        Cancels the scheduled window flush, if any, and starts a task that
+        classifies the batch and resolves each caller's future.
+        """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._classify_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _classify_batch(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        """
+        Classify a batch of queries with the LLM and resolve their futures.
+
+        A batch of one is sent with the single-query prompt. Any error raised by
+        the LLM is propagated to every caller in the batch.
+
+        Args:
+            batch: Pending (query, future) pairs to classify.
+        """
+        queries = [query for query, _ in batch]
+        try:
+            if len(queries) == 1:
+                route_types = [await self._invoke_single(queries[0])]
+            else:
+                route_types = await self._invoke_batch(queries)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), route_type in zip(batch, route_types):
+            if not future.done():
+                future.set_result(route_type)
+
+    async def _invoke_single(self, query: str) -> RouteType:
+        """
+        Classify a single query with the router prompt.
+
+        Args:
+            query: The customer query string to classify.
+
+        Returns:
+            RouteType enum value parsed from the LLM response.
+        """
+        messages = [self._system_msg, HumanMessage(content=query)]
+        response = await self.llm.ainvoke_messages(messages)
         return _parse_classification(response.content)
 
+    async def _invoke_batch(self, queries: list[str]) -> list[RouteType]:
+        """
+        Classify several queries with a single LLM call using the batch prompt.
+
+        Args:
+            queries: The customer query strings to classify.
+
+        Returns:
+            List of RouteType enum values, in the same order as the queries.
+        """
+        # Each query is collapsed onto one line so that embedded newlines or
+        # "2. ..." lines can't break the numbering or pose as other queries
+        numbered = "\n".join(f"{i}. {' '.join(query.split())}" for i, query in enumerate(queries, 1))
+        messages = [self._batch_system_msg, HumanMessage(content=numbered)]
+        response = await self.llm.ainvoke_messages(messages)
+        return _parse_batch_classification(response.content, len(queries))
+
@@ -1,13 +1,29 @@
+import asyncio
+import importlib.util
+import inspect
 import re
 import httpx
+import numpy as np
+import orjson
 
 from abc import ABC, abstractmethod
+from typing import AsyncIterator, Awaitable, Optional
+from langchain_core.embeddings import Embeddings
+from loguru import logger
 
 from src.models.schemas import QueryResponse
+from src.router.system_prompt import GENERAL_SUPPORT_SYSTEM_PROMPT
 from src.services.llm import LangchainLLM
 from config import REFUND_DATABASE, SUPPORT_API_URL
 
 
+_ORDER_ID_RE = re.compile(r'#?(\d+)')
+
+# HTTP/2 needs the h2 package (installed through httpx[http2]); without it the
+# support API client falls back to HTTP/1.1 instead of failing to start
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
 class Handler(ABC):
     """
     Abstract base class for query handlers.
@@ -15,9 +31,13 @@ class Handler(ABC):
     Defines the interface that all query handlers must implement. Each handler
     is responsible for processing a specific type of customer query and returning
     a structured response.
+
+    Handlers that perform I/O implement `handle` as a coroutine. Handlers that do
+    not may implement it as a plain method. Callers await the result of `handle`
+    only if it is awaitable, so plain methods skip the event loop.
     """
     @abstractmethod
-    async def handle(self, query: str) -> QueryResponse:
+    def handle(self, query: str) -> QueryResponse | Awaitable[QueryResponse]:
         """
         Handle a customer query and return a response.
 
@@ -29,6 +49,34 @@ class Handler(ABC):
         """
         pass
 
+    async def stream_handle(self, query: str) -> AsyncIterator[str]:
+        """
+        Handle a customer query and yield the response text incrementally.
+
+        The default implementation yields the complete response text from
+        `handle` as a single chunk. Handlers that generate text progressively
+        override it to yield chunks as they become available.
+
+        Args:
+            query: The customer query string to handle.
+
+        Yields:
+            Chunks of the response text.
+        """
+        response = self.handle(query)
+        if inspect.isawaitable(response):
+            response = await response
+        yield response.response
+
+    async def aclose(self) -> None:
+        """
+        Release resources held by the handler.
+
+        The default implementation does nothing. Handlers that own resources,
+        such as HTTP connections, override it.
+        """
+        pass
+
 
 class RefundHandler(Handler):
     """
@@ -36,8 +84,9 @@ class RefundHandler(Handler):
 
     Processes queries about refunds, returns, and refund status. Extracts order IDs
     from queries and retrieves refund status information from the mock database.
+    Performs no I/O, so `handle` is synchronous.
     """
-    async def handle(self, query: str) -> QueryResponse:
+    def handle(self, query: str) -> QueryResponse:
         """
         Handle a refund-related query.
 
@@ -73,7 +122,7 @@ class RefundHandler(Handler):
         Returns:
             The extracted order ID as a string, or "UNKNOWN" if no ID is found.
         """
-        match = re.search(r'#?(\d+)', query)
+        match = _ORDER_ID_RE.search(query)
         return match.group(1) if match else "UNKNOWN"
 
     @staticmethod
@@ -91,10 +140,7 @@ class RefundHandler(Handler):
             The refund status string (e.g., "Processed", "Pending", "Rejected"),
             or "Order not found" if the order ID doesn't exist in the database.
         """
-
-        # Mock database
-        mock_data = REFUND_DATABASE
-        return mock_data.get(order_id, "Order not found")
+        return REFUND_DATABASE.get(order_id, "Order not found")
 
 
 class TechnicalSupportHandler(Handler):
@@ -106,12 +152,36 @@ class TechnicalSupportHandler(Handler):
     """
     TECH_SUPPORT_API_URL = SUPPORT_API_URL
 
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Initialize the technical support handler.
+
+        Creates the HTTP client used for all API calls, so that connections are
+        kept alive and reused across requests instead of performing a new TCP/TLS
+        handshake per call. HTTP/2 multiplexes concurrent requests to the support
+        API over one connection, which also means its hostname is resolved once
+        rather than per connection. The client is closed by `aclose`.
+
+        Args:
+            transport: Optional httpx transport for the client, e.g. a
+                       MockTransport in tests. Defaults to the network transport.
+        """
+        self._client = httpx.AsyncClient(
+            transport=transport,
+            http2=_HTTP2_AVAILABLE,
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
+        )
+        # Bounds concurrent outbound API requests so that bursts of traffic wait
+        # here instead of piling up in the connection pool and timing out.
+        self._semaphore = asyncio.Semaphore(100)
+
     async def handle(self, query: str) -> QueryResponse:
         """
         Handle a technical support query.
 
         Creates a support ticket via API and fetches a solution from the knowledge
-        base, then returns both in a structured response.
+        base concurrently, then returns both in a structured response.
 
         Args:
             query: The technical support query.
@@ -120,8 +190,10 @@ class TechnicalSupportHandler(Handler):
             QueryResponse with route='TECHNICAL_SUPPORT', solution text,
             and data containing the ticket_id.
         """
-        ticket_id = await self._create_support_ticket(query)
-        solution = await self._fetch_solution(query)
+        ticket_id, solution = await asyncio.gather(
+            self._create_support_ticket(query),
+            self._fetch_solution(query)
+        )
         return QueryResponse(
             route="TECHNICAL_SUPPORT",
             response=solution,
@@ -142,18 +214,18 @@ class TechnicalSupportHandler(Handler):
         Returns:
             The ticket ID returned by the API, or "TECH-001" as fallback if the call fails.
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
+        try:
+            async with self._semaphore:
+                response = await self._client.post(
                     f"{self.TECH_SUPPORT_API_URL}/tickets",
-                    json={"description": query},
-                    timeout=5.0
+                    content=orjson.dumps({"description": query}),
+                    headers={"content-type": "application/json"}
                 )
-                response.raise_for_status()
-                ticket_data = response.json()
-                return ticket_data.get("ticket_id", "TECH-001")
-            except (httpx.RequestError, httpx.HTTPStatusError):
-                return "TECH-001"
+            response.raise_for_status()
+            ticket_data = orjson.loads(response.content)
+            return ticket_data.get("ticket_id", "TECH-001")
+        except (httpx.RequestError, httpx.HTTPStatusError):
+            return "TECH-001"
 
     async def _fetch_solution(self, query: str) -> str:
         """
@@ -170,18 +242,21 @@ class TechnicalSupportHandler(Handler):
             A solution string from the knowledge base, or a generic fallback
             solution if the API call fails.
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
+        try:
+            async with self._semaphore:
+                response = await self._client.get(
                     f"{self.TECH_SUPPORT_API_URL}/search",
-                    params={"q": query},
-                    timeout=5.0
+                    params={"q": query}
                 )
-                response.raise_for_status()
-                solution_data = response.json()
-                return solution_data.get("solution", "Please try restarting the application and clearing the cache.")
-            except (httpx.RequestError, httpx.HTTPStatusError):
-                return "Please try restarting the application and clearing the cache."
+            response.raise_for_status()
+            solution_data = orjson.loads(response.content)
+            return solution_data.get("solution", "Please try restarting the application and clearing the cache.")
+        except (httpx.RequestError, httpx.HTTPStatusError):
+            return "Please try restarting the application and clearing the cache."
+
+    async def aclose(self) -> None:
+        """Close the HTTP client and release its pooled connections."""
+        await self._client.aclose()
 
 
 class GeneralChatHandler(Handler):
@@ -190,22 +265,36 @@ class GeneralChatHandler(Handler):
 
     Processes general customer inquiries, greetings, and feedback that don't fit
     into specific categories. Uses an LLM to generate natural, friendly responses.
+    When an embedding model is provided, responses are cached semantically so that
+    near-identical queries (e.g. "Hi!" and "Hello!") reuse a previous answer.
     """
-    def __init__(self, llm_provider: LangchainLLM):
+    SIMILARITY_THRESHOLD = 0.92
+    MAX_CACHE_SIZE = 1000
+
+    def __init__(self, llm_provider: LangchainLLM, embeddings: Optional[Embeddings] = None):
         """
         Initialize the general chat handler.
 
         Args:
             llm_provider: The LLM provider instance used to generate responses.
+            embeddings: Optional LangChain embedding model used for the semantic
+                        response cache. Caching is disabled if not provided.
         """
         self.llm = llm_provider
+        self.embeddings = embeddings
+        # Cached query embeddings are stacked into one matrix, used as a ring
+        # buffer, so a lookup is a single matrix-vector product
+        self._cache_matrix: Optional[np.ndarray] = None
+        self._cache_responses: list[QueryResponse] = []
+        self._cache_next = 0
 
     async def handle(self, query: str) -> QueryResponse:
         """
         Handle a general chat query using the LLM.
 
-        Sends the query to the LLM with a system prompt instructing it to act
-        as a friendly customer support agent, then returns the generated response.
+        Returns a cached response if a semantically similar query was answered
+        before. Otherwise sends the query to the LLM with a system prompt instructing
+        it to act as a friendly customer support agent, then returns the generated response.
 
         Args:
             query: The customer's general query or message.
@@ -214,12 +303,138 @@ class GeneralChatHandler(Handler):
             QueryResponse with route='GENERAL_CHIT_CHAT', LLM-generated response,
             and data containing the model name used.
         """
-        response = await self.llm.invoke([
-            {"role": "system", "content": "You are a friendly customer support agent. Answer briefly and helpfully."},
-            {"role": "user", "content": query}
-        ])
-        return QueryResponse(
+        embedding, cached = await self._check_cache(query)
+        if cached is not None:
+            return cached
+
+        response = await self.llm.invoke(self._build_messages(query))
+        result = QueryResponse(
             route="GENERAL_CHIT_CHAT",
             response=response.content,
             data={"model": response.model}
-        )
\ No newline at end of file
+        )
+        if embedding is not None:
+            self._store_cache(embedding, result)
+        return result
+
+    async def stream_handle(self, query: str) -> AsyncIterator[str]:
+        """
+        Handle a general chat query, yielding the LLM response as it is generated.
+
+        Streaming lowers the time until the customer sees the first words of the
+        answer. Cached responses are yielded as a single chunk, and newly generated
+        responses are added to the semantic cache once the stream finishes.
+
+        Args:
+            query: The customer's general query or message.
+
+        Yields:
+            Chunks of the LLM-generated response text.
+        """
+        embedding, cached = await self._check_cache(query)
+        if cached is not None:
+            yield cached.response
+            return
+
+        chunks = []
+        async for chunk in self.llm.stream(self._build_messages(query)):
+            chunks.append(chunk)
+            yield chunk
+
+        if embedding is not None:
+            self._store_cache(embedding, QueryResponse(
+                route="GENERAL_CHIT_CHAT",
+                response="".join(chunks),
+                data={"model": self.llm.get_model_name()}
+            ))
+
+    @staticmethod
+    def _build_messages(query: str) -> list[dict]:
+        """
+        Build the LLM messages for a general chat query.
+
+        Args:
+            query: The customer's general query or message.
+
+        Returns:
+            List of message dictionaries with the support agent system prompt
+            followed by the customer's query.
+        """
+        return [
+            {"role": "system", "content": GENERAL_SUPPORT_SYSTEM_PROMPT},
+            {"role": "user", "content": query}
+        ]
+
+    async def _check_cache(self, query: str) -> tuple[Optional[np.ndarray], Optional[QueryResponse]]:
+        """
+        Embed the query and look it up in the semantic cache.
+
+        If the embedding model fails, the error is logged and the cache is
+        skipped so that the query is still answered by the LLM.
+
+        Args:
+            query: The customer's general query or message.
+
+        Returns:
+            Tuple of the normalized query embedding and the cached response.
+            Both are None if semantic caching is disabled or embedding fails;
+            the response is None on a cache miss.
+        """
+        if self.embeddings is None:
+            return None, None
+        try:
+            vector = await self.embeddings.aembed_query(query)
+        except Exception as e:
+            logger.warning(f"Embedding failed, skipping semantic cache: {e}")
+            return None, None
+        embedding = _normalize(vector)
+        return embedding, self._lookup_cache(embedding)
+
+    def _lookup_cache(self, embedding: np.ndarray) -> Optional[QueryResponse]:
+        """
+        Find the cached response whose query is most similar to the given one.
+
+        Args:
+            embedding: Normalized embedding of the incoming query.
+
+        Returns:
+            The cached QueryResponse if its cosine similarity exceeds
+            SIMILARITY_THRESHOLD, otherwise None.
+        """
+        if not self._cache_responses:
+            return None
+        scores = self._cache_matrix[:len(self._cache_responses)] @ embedding
+        best = int(np.argmax(scores))
+        return self._cache_responses[best] if scores[best] > self.SIMILARITY_THRESHOLD else None
+
+    def _store_cache(self, embedding: np.ndarray, response: QueryResponse) -> None:
+        """
+        Add a response to the semantic cache, overwriting the oldest entry when full.
+
+        Args:
+            embedding: Normalized embedding of the query that produced the response.
+            response: The QueryResponse to cache.
+        """
+        if self._cache_matrix is None:
+            self._cache_matrix = np.empty((self.MAX_CACHE_SIZE, embedding.shape[0]), dtype=np.float32)
+        self._cache_matrix[self._cache_next] = embedding
+        if len(self._cache_responses) < self.MAX_CACHE_SIZE:
+            self._cache_responses.append(response)
+        else:
+            self._cache_responses[self._cache_next] = response
+        self._cache_next = (self._cache_next + 1) % self.MAX_CACHE_SIZE
+
+
+def _normalize(vector: list[float]) -> np.ndarray:
+    """
+    Scale a vector to unit length so that dot products equal cosine similarity.
+
+    Args:
+        vector: The vector to normalize.
+
+    Returns:
+        The normalized vector, or the input unchanged if it has zero length.
+    """
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
@@ -1,18 +1,44 @@
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import SystemMessage
 
-ROUTER_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", """You are a customer support router. Classify incoming queries into exactly ONE category:
+ROUTER_SYSTEM_PROMPT = """You are a customer support router. Classify incoming queries into exactly ONE category:
 
 Categories:
 - REFUND_REQUEST: Refund/return/refund status questions
 - TECHNICAL_SUPPORT: Technical issues, bugs, app crashes
 - GENERAL_CHIT_CHAT: Everything else (greetings, compliments, general questions)
 
-Respond with ONLY the category name in ALL CAPS. Nothing else."""),
-    ("user", "{query}")
-])
+Respond with ONLY the category name in ALL CAPS. Nothing else."""
 
-GENERAL_SUPPORT_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", "You are a friendly customer support agent. Answer briefly and helpfully."),
-    ("user", "{query}")
-])
\ No newline at end of file
+ROUTER_BATCH_SYSTEM_PROMPT = """You are a customer support router. Classify each numbered query into exactly ONE category:
+
+Categories:
+- REFUND_REQUEST: Refund/return/refund status questions
+- TECHNICAL_SUPPORT: Technical issues, bugs, app crashes
+- GENERAL_CHIT_CHAT: Everything else (greetings, compliments, general questions)
+
+Respond with one line per query, in the same order, formatted as "<number>. <CATEGORY>".
+Use ONLY the category names in ALL CAPS. Nothing else."""
+
+GENERAL_SUPPORT_SYSTEM_PROMPT = "You are a friendly customer support agent. Answer briefly and helpfully."
+
+
+def build_system_message(content: str, model_name: str) -> SystemMessage:
+    """
+    Build a system message, marking it for provider-side prompt caching where needed.
+
+    OpenAI caches stable prompt prefixes automatically, so the system prompt only
+    has to stay first and unchanged. Anthropic models (directly or via OpenRouter)
+    cache only blocks explicitly marked with cache_control.
+
+    Args:
+        content: The system prompt text.
+        model_name: Name of the model the message will be sent to.
+
+    Returns:
+        SystemMessage with the prompt, as a cacheable content block for Claude models.
+    """
+    if "claude" in model_name.lower():
+        return SystemMessage(content=[
+            {"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}
+        ])
+    return SystemMessage(content=content)
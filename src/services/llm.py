@@ -1,11 +1,28 @@
+import asyncio
+import hashlib
+import json
+import time
+
 from abc import ABC, abstractmethod
-from typing import Optional
+from collections import OrderedDict
+from typing import AsyncIterator, Optional
 from langchain_core.language_models import BaseLanguageModel
-from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 
 from models.llm import LLMResponse
 
 
+# Maps message roles to LangChain message classes; unknown roles become HumanMessage
+_ROLE_MAP = {
+    'system': SystemMessage,
+    'user': HumanMessage,
+    'assistant': AIMessage
+}
+
+# Marks the end of a model stream in the queue filled by LangchainLLM._pump_stream
+_STREAM_END = object()
+
+
 class BaseLLM(ABC):
     """
     Abstract base class for LLM providers.
@@ -28,6 +45,35 @@ class BaseLLM(ABC):
         """
         pass
 
+    @abstractmethod
+    async def ainvoke_messages(self, messages: list[BaseMessage]) -> LLMResponse:
+        """
+        Invoke the LLM with a list of LangChain message objects.
+
+        Lets callers that already hold BaseMessage objects skip the
+        dictionary format used by `invoke`.
+
+        Args:
+            messages: List of LangChain BaseMessage objects.
+
+        Returns:
+            LLMResponse object containing the model's response and metadata.
+        """
+        pass
+
+    @abstractmethod
+    def stream(self, messages: list[dict]) -> AsyncIterator[str]:
+        """
+        Invoke the LLM and yield the response text as it is generated.
+
+        Args:
+            messages: List of dictionaries with 'role' and 'content' keys.
+
+        Yields:
+            Chunks of the model's response text.
+        """
+        pass
+
     @abstractmethod
     def get_model_name(self) -> str:
         """Get the name of the model being used"""
@@ -40,23 +86,42 @@ class LangchainLLM(BaseLLM):
 
     Provides a unified interface for interacting with any LangChain-supported
     language model (OpenAI, Anthropic Claude, Ollama, etc.). Handles message
-    format conversion and standardized response formatting.
+    format conversion and standardized response formatting. Identical requests
+    are served from a bounded in-memory cache instead of calling the model again,
+    and the number of concurrent model calls is bounded to avoid overloading
+    the event loop and the provider under heavy traffic.
     """
-    def __init__(self, model: BaseLanguageModel):
+    def __init__(
+        self,
+        model: BaseLanguageModel,
+        cache_size: int = 10_000,
+        cache_ttl: float = 3600.0,
+        max_concurrency: int = 64
+    ):
         """
         Initialize the LangChain LLM wrapper.
 
         Args:
             model: Any LangChain BaseLanguageModel instance (e.g., ChatOpenAI,
                    ChatAnthropic, Ollama, etc.)
+            cache_size: Maximum number of responses kept in the cache.
+                        Set to 0 to disable caching.
+            cache_ttl: Time in seconds after which a cached response expires.
+            max_concurrency: Maximum number of model calls in flight at once.
         """
         self.model = model
+        self._model_name = self._compute_model_name()
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache: OrderedDict[str, tuple[float, LLMResponse]] = OrderedDict()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
 
     async def invoke(self, messages: list[dict]) -> LLMResponse:
         """
         Invoke the LLM asynchronously with the provided messages.
 
-        Converts dictionary-format messages to LangChain message objects,
+        Returns a cached response if the same messages were sent recently.
+        Otherwise converts dictionary-format messages to LangChain message objects,
         calls the model asynchronously, and wraps the response in an LLMResponse object.
 
         Args:
@@ -65,17 +130,177 @@ class LangchainLLM(BaseLLM):
         Returns:
             LLMResponse containing the model's response content and model name.
         """
-        lc_messages = self._convert_messages(messages)
-        response = await self.model.ainvoke(lc_messages)
+        cache_key = self._make_cache_key(messages)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        return await self._invoke_model(cache_key, self._convert_messages(messages))
+
+    async def ainvoke_messages(self, messages: list[BaseMessage]) -> LLMResponse:
+        """
+        Invoke the LLM asynchronously with LangChain message objects.
+
+        Behaves like `invoke`, but passes the messages to the model as-is
+        without any format conversion.
+
+        Args:
+            messages: List of LangChain BaseMessage objects.
+
+        Returns:
+            LLMResponse containing the model's response content and model name.
+        """
+        cache_key = self._make_cache_key(messages)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        return await self._invoke_model(cache_key, messages)
+
+    async def _invoke_model(self, cache_key: str, lc_messages: list[BaseMessage]) -> LLMResponse:
+        """
+        Call the model, wrap its response in an LLMResponse and cache it.
+
+        Args:
+            cache_key: Cache key under which the response is stored.
+            lc_messages: List of LangChain BaseMessage objects to send.
 
-        return LLMResponse(
+        Returns:
+            LLMResponse containing the model's response content and model name.
+        """
+        async with self._semaphore:
+            response = await self.model.ainvoke(lc_messages)
+
+        result = LLMResponse(
             content=response.content,
             model=self.get_model_name()
         )
+        self._set_cached(cache_key, result)
+        return result
+
+    async def stream(self, messages: list[dict]) -> AsyncIterator[str]:
+        """
+        Stream the LLM response for the provided messages.
+
+        Yields a cached response as a single chunk if the same messages were sent
+        recently. Otherwise yields chunks from the model as they are generated and
+        caches the complete response once the stream finishes. The model is read
+        by a separate task, so a slow consumer doesn't hold a concurrency slot.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys.
+
+        Yields:
+            Chunks of the model's response text.
+        """
+        cache_key = self._make_cache_key(messages)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            yield cached.content
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        pump = asyncio.create_task(self._pump_stream(self._convert_messages(messages), queue))
+        chunks = []
+        try:
+            while (chunk := await queue.get()) is not _STREAM_END:
+                chunks.append(chunk)
+                yield chunk
+            # Re-raises any error from the model stream
+            await pump
+        finally:
+            pump.cancel()
+
+        self._set_cached(cache_key, LLMResponse(
+            content="".join(chunks),
+            model=self.get_model_name()
+        ))
+
+    async def _pump_stream(self, lc_messages: list[BaseMessage], queue: asyncio.Queue) -> None:
+        """
+        Read the model stream into a queue while holding a concurrency slot.
+
+        The slot is released as soon as the model finishes generating, regardless
+        of how fast the queued chunks are consumed. _STREAM_END is always queued
+        last, including when the stream fails.
+
+        Args:
+            lc_messages: List of LangChain BaseMessage objects to send.
+            queue: Queue receiving the response text chunks.
+        """
+        try:
+            async with self._semaphore:
+                async for chunk in self.model.astream(lc_messages):
+                    queue.put_nowait(chunk.content)
+        finally:
+            queue.put_nowait(_STREAM_END)
+
+    def _make_cache_key(self, messages: list[dict] | list[BaseMessage]) -> str:
+        """
+        Build a cache key for a request from the model name and messages.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys,
+                      or list of LangChain BaseMessage objects.
+
+        Returns:
+            Hex digest uniquely identifying the request.
+        """
+        serialized = [msg if isinstance(msg, dict) else [msg.type, msg.content] for msg in messages]
+        payload = json.dumps([self.get_model_name(), serialized], sort_keys=True)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def _get_cached(self, key: str) -> Optional[LLMResponse]:
+        """
+        Look up a cached response, evicting it if it has expired.
+
+        Args:
+            key: Cache key produced by _make_cache_key.
+
+        Returns:
+            The cached LLMResponse, or None on a miss or expired entry.
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.monotonic() - stored_at > self.cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return response
+
+    def _set_cached(self, key: str, response: LLMResponse) -> None:
+        """
+        Store a response in the cache, evicting the least recently used entries
+        once the cache exceeds its maximum size.
+
+        Args:
+            key: Cache key produced by _make_cache_key.
+            response: The LLMResponse to cache.
+        """
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = (time.monotonic(), response)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
 
     def get_model_name(self) -> str:
         """
-        Extract and return the model name from the underlying LangChain model.
+        Return the name of the underlying LangChain model.
+
+        The name is resolved once at initialization, since it doesn't change
+        during the lifetime of the wrapper.
+
+        Returns:
+            String representation of the model name.
+        """
+        return self._model_name
+
+    def _compute_model_name(self) -> str:
+        """
+        Extract the model name from the underlying LangChain model.
 
         Attempts to retrieve the model name from various possible attributes
         (model_name, model) and falls back to the class name if neither is found.
@@ -95,7 +320,8 @@ class LangchainLLM(BaseLLM):
         Convert dictionary-format messages to LangChain message objects.
 
         Transforms a list of message dictionaries into the appropriate LangChain
-        message types (SystemMessage for 'system' role, HumanMessage for others).
+        message types (SystemMessage for 'system', AIMessage for 'assistant' and
+        HumanMessage for all other roles).
 
         Args:
             messages: List of dictionaries with 'role' and 'content' keys.
@@ -103,14 +329,4 @@ class LangchainLLM(BaseLLM):
         Returns:
             List of LangChain BaseMessage objects.
         """
-        lc_messages = []
-        for msg in messages:
-            role = msg.get('role', 'user')
-            content = msg.get('content', '')
-
-            if role == 'system':
-                lc_messages.append(SystemMessage(content=content))
-            else:
-                lc_messages.append(HumanMessage(content=content))
-
-        return lc_messages
\ No newline at end of file
+        return [_ROLE_MAP.get(msg['role'], HumanMessage)(content=msg['content']) for msg in messages]
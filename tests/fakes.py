@@ -0,0 +1,51 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+
+class FakeChatModel:
+    """
+    Minimal stand-in for a LangChain chat model.
+
+    Replies with the result of `reply(messages)` and records every call.
+    """
+    model_name = "fake-model"
+
+    def __init__(self, reply=lambda messages: "ok", delay: float = 0.0, error: Exception | None = None):
+        self.reply = reply
+        self.delay = delay
+        self.error = error
+        self.calls: list[list] = []
+
+    async def ainvoke(self, messages):
+        self.calls.append(messages)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return AIMessage(content=self.reply(messages))
+
+    async def astream(self, messages):
+        self.calls.append(messages)
+        for word in self.reply(messages).split(" "):
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield AIMessageChunk(content=word + " ")
+
+
+class FakeEmbeddings:
+    """
+    Minimal stand-in for a LangChain embedding model.
+
+    Returns the vector registered for a query, or raises `error` if set.
+    """
+    def __init__(self, vectors: dict[str, list[float]], error: Exception | None = None):
+        self.vectors = vectors
+        self.error = error
+        self.calls = 0
+
+    async def aembed_query(self, text: str) -> list[float]:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.vectors[text]
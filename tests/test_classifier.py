@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from src.router.classifier import QueryClassifier, RouteType, _match_keywords
+from src.services.llm import LangchainLLM
+from tests.fakes import FakeChatModel
+
+
+@pytest.mark.parametrize("query", [
+    "Where is my refund for order #12345?",
+    "Can I get refunded?",
+    "refunds please",
+    "my item was returned",
+    "I want my money back",
+])
+def test_match_keywords_refund(query):
+    assert _match_keywords(query) == RouteType.REFUND_REQUEST
+
+
+@pytest.mark.parametrize("query", [
+    "The app keeps crashing on login",
+    "It keeps crashing",
+    "I found bugs",
+    "I got errors",
+    "I can't log in",
+    "Password reset doesn't work",
+    "Checkout is not working",
+    "It doesn't work",
+    "The checkout isn't working",
+    "Payments won't work",
+    "Checkout doesn’t work",
+])
+def test_match_keywords_technical_support(query):
+    assert _match_keywords(query) == RouteType.TECHNICAL_SUPPORT
+
+
+@pytest.mark.parametrize("query", [
+    "Hi! Just wanted to say your service is great!",
+    "Thanks, have a nice day",
+    "I'm happy with the apple pie recipe",
+    "Hi! Just wanted to say your app is great!",
+])
+def test_match_keywords_general_chat(query):
+    assert _match_keywords(query) == RouteType.GENERAL_CHIT_CHAT
+
+
+def test_match_keywords_refund_takes_precedence_over_tech():
+    assert _match_keywords("The app crashed, I want a refund") == RouteType.REFUND_REQUEST
+
+
+def test_match_keywords_long_unmatched_query_is_ambiguous():
+    query = "I would like to know more about the different subscription plans you offer for families"
+    assert len(query) > 80
+    assert _match_keywords(query) is None
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Where is my refund for order #12345?", RouteType.REFUND_REQUEST),
+    ("Order 12345 still has no refund", RouteType.REFUND_REQUEST),
+    ("The app keeps crashing on login", RouteType.TECHNICAL_SUPPORT),
+    ("I'm unable to log in", RouteType.TECHNICAL_SUPPORT),
+    ("Checkout shows error code 502", RouteType.TECHNICAL_SUPPORT),
+])
+def test_classify_high_confidence_queries_skip_llm(query, expected):
+    model = FakeChatModel()
+    classifier = QueryClassifier(LangchainLLM(model))
+
+    assert asyncio.run(classifier.classify(query)) == expected
+    assert model.calls == []
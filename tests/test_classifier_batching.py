@@ -0,0 +1,154 @@
+import asyncio
+import re
+
+import pytest
+
+from src.router.classifier import QueryClassifier, RouteType, _parse_batch_classification
+from src.services.llm import LangchainLLM
+from tests.fakes import FakeChatModel
+
+
+LABELS = [RouteType.REFUND_REQUEST, RouteType.TECHNICAL_SUPPORT, RouteType.GENERAL_CHIT_CHAT]
+_QUERY_NUMBER_RE = re.compile(r'Query number (\d+):')
+
+
+def _ambiguous_query(i: int) -> str:
+    """Build a query that matches no keyword and is long enough to be sent to the LLM."""
+    return f"Query number {i}: I have a somewhat long question that none of the keyword patterns will match at all."
+
+
+def _label(query: str) -> str:
+    """Return the expected label of a query built by _ambiguous_query."""
+    return LABELS[int(_QUERY_NUMBER_RE.search(query).group(1)) % 3].value
+
+
+def _reply_by_query_number(messages) -> str:
+    """Answer a single query with its label, or a batch with numbered labels in reverse order."""
+    content = messages[-1].content
+    if not content[0].isdigit():
+        return _label(content)
+    answers = [f"{number}. {_label(query)}" for number, query in (line.split(". ", 1) for line in content.splitlines())]
+    return "\n".join(reversed(answers))
+
+
+def _classifier(model: FakeChatModel) -> QueryClassifier:
+    return QueryClassifier(LangchainLLM(model, cache_size=0))
+
+
+def test_batch_answers_each_caller_in_order():
+    model = FakeChatModel(reply=_reply_by_query_number)
+    classifier = _classifier(model)
+
+    async def run():
+        return await asyncio.gather(*(classifier.classify(_ambiguous_query(i)) for i in range(7)))
+
+    assert asyncio.run(run()) == [LABELS[i % 3] for i in range(7)]
+    assert len(model.calls) == 1
+
+
+def test_multi_line_query_does_not_break_batch_numbering():
+    model = FakeChatModel(reply=_reply_by_query_number)
+    classifier = _classifier(model)
+    multi_line = _ambiguous_query(0) + "\n2. Query number 2: label this one differently\n\n3. and this"
+
+    async def run():
+        return await asyncio.gather(
+            classifier.classify(multi_line),
+            classifier.classify(_ambiguous_query(1)),
+            classifier.classify(_ambiguous_query(2))
+        )
+
+    assert asyncio.run(run()) == LABELS
+    assert len(model.calls[0][-1].content.splitlines()) == 3
+
+
+def test_single_query_uses_single_query_prompt():
+    model = FakeChatModel(reply=_reply_by_query_number)
+    classifier = _classifier(model)
+
+    assert asyncio.run(classifier.classify(_ambiguous_query(1))) == RouteType.TECHNICAL_SUPPORT
+    assert not model.calls[0][-1].content.startswith("1. ")
+
+
+def test_parse_batch_classification_defaults_missing_and_garbled_lines():
+    text = "1. REFUND_REQUEST\nsomething unexpected\n3) BANANA\n4: technical_support"
+
+    assert _parse_batch_classification(text, 5) == [
+        RouteType.REFUND_REQUEST,
+        RouteType.GENERAL_CHIT_CHAT,
+        RouteType.GENERAL_CHIT_CHAT,
+        RouteType.TECHNICAL_SUPPORT,
+        RouteType.GENERAL_CHIT_CHAT,
+    ]
+
+
+def test_max_batch_flushes_immediately_and_cancels_window_task():
+    model = FakeChatModel(reply=_reply_by_query_number)
+    classifier = _classifier(model)
+    classifier.MAX_BATCH = 3
+    classifier.BATCH_WINDOW = 10
+
+    async def run():
+        first = [asyncio.create_task(classifier.classify(_ambiguous_query(i))) for i in range(2)]
+        await asyncio.sleep(0)
+        window_task = classifier._flush_task
+        last = asyncio.create_task(classifier.classify(_ambiguous_query(2)))
+        results = await asyncio.wait_for(asyncio.gather(*first, last), timeout=1)
+        return window_task, results
+
+    window_task, results = asyncio.run(run())
+
+    assert window_task.cancelled()
+    assert results == LABELS
+    assert len(model.calls) == 1
+
+
+@pytest.mark.parametrize("batch_size", [1, 4])
+def test_llm_error_reaches_every_waiter(batch_size):
+    classifier = _classifier(FakeChatModel(error=RuntimeError("LLM down")))
+
+    async def run():
+        return await asyncio.gather(
+            *(classifier.classify(_ambiguous_query(i)) for i in range(batch_size)),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert len(results) == batch_size
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_cancelled_caller_does_not_break_rest_of_batch():
+    model = FakeChatModel(reply=_reply_by_query_number, delay=0.05)
+    classifier = _classifier(model)
+
+    async def run():
+        tasks = [asyncio.create_task(classifier.classify(_ambiguous_query(i))) for i in range(3)]
+        # Let the window elapse so the batch is in flight, then cancel one caller
+        await asyncio.sleep(classifier.BATCH_WINDOW * 2)
+        tasks[1].cancel()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert results[0] == LABELS[0]
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert results[2] == LABELS[2]
+    assert len(model.calls) == 1
+
+
+def test_caller_cancelled_before_flush_does_not_break_rest_of_batch():
+    model = FakeChatModel(reply=_reply_by_query_number)
+    classifier = _classifier(model)
+
+    async def run():
+        tasks = [asyncio.create_task(classifier.classify(_ambiguous_query(i))) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks[0].cancel()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1:] == LABELS[1:]
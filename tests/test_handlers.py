@@ -0,0 +1,151 @@
+import asyncio
+
+import httpx
+import orjson
+
+from config import SUPPORT_API_URL
+from src.router import CustomerSupportRouter
+from src.router.classifier import RouteType
+from src.router.handlers import GeneralChatHandler, TechnicalSupportHandler
+from src.services.llm import LangchainLLM
+from tests.fakes import FakeChatModel, FakeEmbeddings
+
+
+def _handler(model, embeddings):
+    return GeneralChatHandler(LangchainLLM(model, cache_size=0), embeddings)
+
+
+def test_general_chat_semantic_cache_hit():
+    model = FakeChatModel(reply=lambda messages: f"reply to {messages[-1].content}")
+    embeddings = FakeEmbeddings({"Hi!": [1.0, 0.0], "Hello!": [0.99, 0.05]})
+    handler = _handler(model, embeddings)
+
+    first = asyncio.run(handler.handle("Hi!"))
+    second = asyncio.run(handler.handle("Hello!"))
+
+    assert second == first
+    assert len(model.calls) == 1
+
+
+def test_general_chat_semantic_cache_miss():
+    model = FakeChatModel()
+    embeddings = FakeEmbeddings({"Hi!": [1.0, 0.0], "Where are you located?": [0.0, 1.0]})
+    handler = _handler(model, embeddings)
+
+    asyncio.run(handler.handle("Hi!"))
+    asyncio.run(handler.handle("Where are you located?"))
+
+    assert len(model.calls) == 2
+
+
+def test_general_chat_embedding_failure_falls_back_to_llm():
+    model = FakeChatModel(reply=lambda messages: "hello")
+    handler = _handler(model, FakeEmbeddings({}, error=RuntimeError("embeddings down")))
+
+    result = asyncio.run(handler.handle("Hi!"))
+
+    assert result.response == "hello"
+    assert len(model.calls) == 1
+
+
+def test_general_chat_semantic_cache_evicts_oldest_entry():
+    model = FakeChatModel(reply=lambda messages: messages[-1].content)
+    embeddings = FakeEmbeddings({"a": [1.0, 0.0, 0.0], "b": [0.0, 1.0, 0.0], "c": [0.0, 0.0, 1.0]})
+    handler = _handler(model, embeddings)
+    handler.MAX_CACHE_SIZE = 2
+
+    for query in ["a", "b", "c", "a"]:
+        asyncio.run(handler.handle(query))
+
+    assert len(model.calls) == 4
+    assert asyncio.run(handler.handle("c")).response == "c"
+    assert len(model.calls) == 4
+
+
+def _support_transport(tickets_response, search_response):
+    """Build a MockTransport answering the ticket and search endpoints and recording requests."""
+    requests = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("/tickets"):
+            return tickets_response(request)
+        return search_response(request)
+
+    return httpx.MockTransport(handle), requests
+
+
+def test_technical_support_success():
+    transport, requests = _support_transport(
+        lambda request: httpx.Response(201, json={"ticket_id": "TECH-42"}),
+        lambda request: httpx.Response(200, json={"solution": "Reinstall the app."})
+    )
+    handler = TechnicalSupportHandler(transport)
+
+    result = asyncio.run(handler.handle("The app keeps crashing"))
+
+    assert result.route == "TECHNICAL_SUPPORT"
+    assert result.response == "Reinstall the app."
+    assert result.data == {"ticket_id": "TECH-42"}
+    ticket_request = next(r for r in requests if r.method == "POST")
+    assert ticket_request.url == f"{SUPPORT_API_URL}/tickets"
+    assert ticket_request.headers["content-type"] == "application/json"
+    assert orjson.loads(ticket_request.content) == {"description": "The app keeps crashing"}
+    search_request = next(r for r in requests if r.method == "GET")
+    assert search_request.url.path.endswith("/search")
+    assert search_request.url.params["q"] == "The app keeps crashing"
+
+
+def test_technical_support_server_error_falls_back():
+    transport, _ = _support_transport(
+        lambda request: httpx.Response(503),
+        lambda request: httpx.Response(500)
+    )
+    handler = TechnicalSupportHandler(transport)
+
+    result = asyncio.run(handler.handle("The app keeps crashing"))
+
+    assert result.response == "Please try restarting the application and clearing the cache."
+    assert result.data == {"ticket_id": "TECH-001"}
+
+
+def test_technical_support_request_error_falls_back():
+    def fail(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    transport, _ = _support_transport(fail, fail)
+    handler = TechnicalSupportHandler(transport)
+
+    result = asyncio.run(handler.handle("The app keeps crashing"))
+
+    assert result.response == "Please try restarting the application and clearing the cache."
+    assert result.data == {"ticket_id": "TECH-001"}
+
+
+def test_technical_support_requests_run_concurrently():
+    in_flight = 0
+    both_in_flight = asyncio.Event()
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight
+        in_flight += 1
+        if in_flight == 2:
+            both_in_flight.set()
+        # Each request only completes once the other one has started
+        await asyncio.wait_for(both_in_flight.wait(), timeout=1)
+        return httpx.Response(200, json={"ticket_id": "TECH-42", "solution": "Reinstall the app."})
+
+    handler = TechnicalSupportHandler(httpx.MockTransport(handle))
+
+    result = asyncio.run(handler.handle("The app keeps crashing"))
+
+    assert result.data == {"ticket_id": "TECH-42"}
+
+
+def test_router_aclose_closes_support_client():
+    router = CustomerSupportRouter(LangchainLLM(FakeChatModel()))
+    client = router.handlers[RouteType.TECHNICAL_SUPPORT]._client
+
+    asyncio.run(router.aclose())
+
+    assert client.is_closed
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from src.services.llm import LangchainLLM
+from tests.fakes import FakeChatModel
+
+
+def test_invoke_caches_identical_requests():
+    model = FakeChatModel(reply=lambda messages: "hello")
+    llm = LangchainLLM(model)
+    messages = [{"role": "user", "content": "Hi!"}]
+
+    first = asyncio.run(llm.invoke(messages))
+    second = asyncio.run(llm.invoke(messages))
+
+    assert second == first
+    assert len(model.calls) == 1
+
+
+def test_stream_yields_chunks_and_caches_response():
+    model = FakeChatModel(reply=lambda messages: "hello there")
+    llm = LangchainLLM(model)
+    messages = [{"role": "user", "content": "Hi!"}]
+
+    async def collect():
+        return [chunk async for chunk in llm.stream(messages)]
+
+    assert asyncio.run(collect()) == ["hello ", "there "]
+    assert asyncio.run(collect()) == ["hello there "]
+    assert len(model.calls) == 1
+
+
+def test_stream_releases_slot_before_consumer_finishes():
+    llm = LangchainLLM(FakeChatModel(reply=lambda messages: "a b c"), cache_size=0, max_concurrency=1)
+
+    async def run():
+        stream = llm.stream([{"role": "user", "content": "stream"}])
+        await anext(stream)
+        # The consumer is paused mid-stream; another call must still get the only slot
+        response = await asyncio.wait_for(llm.invoke([{"role": "user", "content": "other"}]), timeout=1)
+        await stream.aclose()
+        return response
+
+    assert asyncio.run(run()).content == "a b c"
+
+
+def test_stream_propagates_model_errors():
+    class FailingStreamModel(FakeChatModel):
+        async def astream(self, messages):
+            yield await super().ainvoke(messages)
+            raise RuntimeError("stream broke")
+
+    llm = LangchainLLM(FailingStreamModel(reply=lambda messages: "partial"))
+
+    async def collect():
+        return [chunk async for chunk in llm.stream([{"role": "user", "content": "Hi!"}])]
+
+    with pytest.raises(RuntimeError, match="stream broke"):
+        asyncio.run(collect())
@@ -0,0 +1,83 @@
+import asyncio
+
+from src.models.schemas import QueryResponse
+from src.router import CustomerSupportRouter
+from src.router.classifier import RouteType
+from src.router.handlers import Handler, RefundHandler
+from src.services.llm import LangchainLLM
+from tests.fakes import FakeChatModel
+
+
+class SpyRefundHandler(RefundHandler):
+    """RefundHandler that records whether `handle` returned a plain QueryResponse."""
+    def __init__(self):
+        self.results = []
+
+    def handle(self, query: str) -> QueryResponse:
+        result = super().handle(query)
+        self.results.append(result)
+        return result
+
+
+class AwaitableReturningHandler(Handler):
+    """Handler whose plain `handle` method returns a coroutine."""
+    def handle(self, query: str):
+        return self._respond(query)
+
+    @staticmethod
+    async def _respond(query: str) -> QueryResponse:
+        return QueryResponse(route="TECHNICAL_SUPPORT", response=f"handled {query}")
+
+
+def _router(model: FakeChatModel | None = None) -> CustomerSupportRouter:
+    return CustomerSupportRouter(LangchainLLM(model or FakeChatModel(), cache_size=0))
+
+
+def test_route_query_calls_refund_handler_synchronously():
+    router = _router()
+    spy = SpyRefundHandler()
+    router.handlers[RouteType.REFUND_REQUEST] = spy
+
+    result = asyncio.run(router.route_query("Where is my refund for order #12345?"))
+
+    assert isinstance(spy.results[0], QueryResponse)
+    assert result == QueryResponse(
+        route="REFUND_REQUEST",
+        response="Refund status for order 12345: Processed",
+        data={"order_id": "12345", "status": "Processed"}
+    )
+    asyncio.run(router.aclose())
+
+
+def test_route_query_awaits_coroutine_handlers():
+    router = _router(FakeChatModel(reply=lambda messages: "Hello!"))
+
+    result = asyncio.run(router.route_query("Hi there"))
+
+    assert result.route == "GENERAL_CHIT_CHAT"
+    assert result.response == "Hello!"
+    asyncio.run(router.aclose())
+
+
+def test_route_query_awaits_awaitable_returned_by_plain_handle(monkeypatch):
+    # Installed before the router is built, in case handlers are inspected at init
+    monkeypatch.setattr(
+        "src.router._initialize_handlers",
+        lambda llm_provider, embeddings=None: {RouteType.TECHNICAL_SUPPORT: AwaitableReturningHandler()}
+    )
+    router = _router()
+
+    result = asyncio.run(router.route_query("It keeps crashing"))
+
+    assert result == QueryResponse(route="TECHNICAL_SUPPORT", response="handled It keeps crashing")
+
+
+def test_stream_query_matches_route_query_for_sync_and_async_handlers():
+    router = _router(FakeChatModel(reply=lambda messages: "Hello!"))
+
+    async def collect(query):
+        return "".join([chunk async for chunk in router.stream_query(query)])
+
+    assert asyncio.run(collect("Where is my refund for order #12345?")) == "Refund status for order 12345: Processed"
+    assert asyncio.run(collect("Hi there")).strip() == "Hello!"
+    asyncio.run(router.aclose())